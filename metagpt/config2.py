@@ -6,14 +6,26 @@
 @File    : config2.py
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Literal, Optional
+from typing import Dict, Iterable, List, Literal, Optional, get_args
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    model_validator,
+)
 
 from metagpt.configs.browser_config import BrowserConfig
 from metagpt.configs.embedding_config import EmbeddingConfig
-from metagpt.configs.enhanced_logging_config import EnhancedLoggingConfig
+from metagpt.configs.enhanced_logging_config import (
+    EnhancedLoggingConfig,
+    _default_enhanced_log_path,
+    _ensure_log_dir,
+)
 from metagpt.configs.exp_pool_config import ExperiencePoolConfig
 from metagpt.configs.llm_config import LLMConfig, LLMType
 from metagpt.configs.mermaid_config import MermaidConfig
@@ -25,6 +37,7 @@ from metagpt.configs.s3_config import S3Config
 from metagpt.configs.search_config import SearchConfig
 from metagpt.configs.workspace_config import WorkspaceConfig
 from metagpt.const import CONFIG_ROOT, METAGPT_ROOT
+from metagpt.enhanced_logger import enhanced_logger
 from metagpt.utils.yaml_model import YamlModel
 
 
@@ -50,6 +63,10 @@ class CLIParams(BaseModel):
 class Config(CLIParams, YamlModel):
     """Configurations for MetaGPT"""
 
+    # Never re-validate (and thereby deep-copy) sub-models that are already
+    # instances: Config nests ~15 of them and is rebuilt often
+    model_config = ConfigDict(revalidate_instances="never", validate_assignment=False, extra="ignore")
+
     # Key Parameters
     llm: LLMConfig
 
@@ -95,7 +112,7 @@ class Config(CLIParams, YamlModel):
     iflytek_api_key: str = ""
     azure_tts_subscription_key: str = ""
     azure_tts_region: str = ""
-    _extra: dict = dict()  # extra config dict
+    _extra: dict = PrivateAttr(default_factory=dict)  # extra config dict
 
     # Role's custom configuration
     roles: Optional[List[RoleCustomConfig]] = None
@@ -107,21 +124,19 @@ class Config(CLIParams, YamlModel):
     def init_enhanced_logging(self):
         """Initialize enhanced logging if enabled"""
         if self.enhanced_logging:
-            from metagpt.enhanced_logger import enhanced_logger
-            from datetime import datetime
-            from metagpt.const import METAGPT_ROOT
-            
             # Set default log file path if not provided
             if not self.enhanced_log_file_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                log_dir = METAGPT_ROOT / "enhanced_logs"
-                log_dir.mkdir(parents=True, exist_ok=True)
-                self.enhanced_log_file_path = str(log_dir / f"{timestamp}.json")
-            
-            enhanced_logger.configure(
-                enabled=self.enhanced_logging,
-                log_file_path=self.enhanced_log_file_path
-            )
+                self.enhanced_log_file_path = str(_default_enhanced_log_path())
+            else:
+                _ensure_log_dir(Path(self.enhanced_log_file_path).parent)
+
+            # Reconfiguring with an unchanged path would re-open the log file and
+            # reprint the banner on every Config construction
+            if not (enhanced_logger.enabled and str(enhanced_logger.log_file_path) == self.enhanced_log_file_path):
+                enhanced_logger.configure(
+                    enabled=self.enhanced_logging,
+                    log_file_path=self.enhanced_log_file_path
+                )
         return self
 
     @classmethod
@@ -143,10 +158,15 @@ class Config(CLIParams, YamlModel):
             CONFIG_ROOT / "config2.yaml",
         )
         if reload or default_config_paths not in _CONFIG_CACHE:
-            dicts = [dict(os.environ), *(Config.read_yaml(path) for path in default_config_paths), kwargs]
+            dicts = [_relevant_env(), *(Config.read_yaml(path) for path in default_config_paths), kwargs]
             final = merge_dict(dicts)
-            _CONFIG_CACHE[default_config_paths] = Config(**final)
-        return _CONFIG_CACHE[default_config_paths]
+            # Full validation only on first load: the YAML on disk is untrusted input
+            _CONFIG_CACHE[default_config_paths] = _CONFIG_TA.validate_python(final)
+            return _CONFIG_CACHE[default_config_paths]
+        # Cache hit: the tree was validated once already, so hand out a cheap
+        # shallow copy via model_construct instead of re-validating everything
+        cached = _CONFIG_CACHE[default_config_paths]
+        return Config.model_construct(**cached.__dict__)
 
     @classmethod
     def from_llm_config(cls, llm_config: dict):
@@ -156,11 +176,43 @@ class Config(CLIParams, YamlModel):
         gpt4 = Config.from_llm_config(llm_config)
         A = Role(name="A", profile="Democratic candidate", goal="Win the election", actions=[a1], watch=[a2], config=gpt4)
         """
-        llm_config = LLMConfig.model_validate(llm_config)
-        dicts = [dict(os.environ)]
-        dicts += [{"llm": llm_config}]
-        final = merge_dict(dicts)
-        return Config(**final)
+        # user input: keep full validation, but reuse results for identical dicts
+        # (tests routinely build many roles from the same llm_config)
+        if isinstance(llm_config, dict):
+            try:
+                llm_config = _validated_llm_config(frozenset(llm_config.items()))
+            except TypeError:  # unhashable values, validate without memoization
+                llm_config = LLMConfig.model_validate(llm_config)
+        else:  # e.g. an LLMConfig instance, accepted since before the memoization
+            llm_config = LLMConfig.model_validate(llm_config)
+        env = _relevant_env()
+        final = merge_dict([env, {"llm": llm_config}])
+        if env:
+            # env strings are untrusted input (e.g. inc="true" must become a
+            # bool and run check_project_path); the already-validated llm
+            # instance is not re-validated thanks to revalidate_instances
+            return _CONFIG_TA.validate_python(final)
+        return Config.from_trusted_dict(final)
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> "Config":
+        """Build a Config from data that has already passed validation once.
+
+        Invariant: every value in `data` must either be an already-validated model
+        instance or come from a previously validated tree. model_construct skips
+        pydantic's recursive validation, which is the dominant cost of building a
+        Config; never feed raw user or YAML input through this path.
+        """
+        built = {}
+        for name, value in data.items():
+            field = cls.model_fields.get(name)
+            if field is not None and isinstance(value, dict):
+                annotation = field.annotation
+                target = next((a for a in get_args(annotation) if a is not type(None)), annotation)
+                if isinstance(target, type) and issubclass(target, BaseModel):
+                    value = target.model_construct(**value)
+            built[name] = value
+        return cls.model_construct(**built)
 
     def update_via_cli(self, project_path, project_name, inc, reqa_file, max_auto_summarize_code):
         """update config via cli"""
@@ -200,9 +252,28 @@ def merge_dict(dicts: Iterable[Dict]) -> Dict:
     """Merge multiple dicts into one, with the latter dict overwriting the former"""
     result = {}
     for dictionary in dicts:
-        result.update(dictionary)
+        result |= dictionary
     return result
 
 
+# Environment variables can only influence Config through keys matching its
+# fields, so everything else is filtered out before each validation pass
+_ENV_ALLOWED = frozenset(Config.model_fields) | frozenset(k.upper() for k in Config.model_fields)
+
+
+def _relevant_env() -> Dict:
+    """The subset of os.environ that Config could actually consume"""
+    return {k: v for k, v in os.environ.items() if k in _ENV_ALLOWED}
+
+
+@lru_cache
+def _validated_llm_config(items: frozenset) -> LLMConfig:
+    """Validate an LLMConfig dict once per distinct content"""
+    return LLMConfig.model_validate(dict(items))
+
+
 _CONFIG_CACHE = {}
+# Built once at import: rebuilding the pydantic-core validator for a tree as
+# deep as Config is expensive, so every validation reuses this adapter
+_CONFIG_TA = TypeAdapter(Config)
 config = Config.default()
@@ -6,18 +6,39 @@
 @File  : enhanced_logging_config.py
 """
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union
 
-from pydantic import field_validator, model_validator
+from pydantic import ConfigDict, field_validator, model_validator
 
 from metagpt.const import METAGPT_ROOT
 from metagpt.utils.yaml_model import YamlModel
 
+_ensured_dirs = set()
+
+
+def _ensure_log_dir(path: Path):
+  """mkdir once per distinct directory; validators run per Config construction"""
+  if path not in _ensured_dirs:
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
+@lru_cache(maxsize=1)
+def _default_enhanced_log_path() -> Path:
+  """Timestamped default log path, computed once per process"""
+  timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+  log_dir = METAGPT_ROOT / "enhanced_logs"
+  _ensure_log_dir(log_dir)
+  return log_dir / f"{timestamp}.jsonl"
+
 
 class EnhancedLoggingConfig(YamlModel):
   """Configuration for enhanced logging system that captures LLM API requests and agent messages"""
-  
+
+  model_config = ConfigDict(revalidate_instances="never", validate_assignment=False, extra="ignore")
+
   enhanced_logging: bool = False
   enhanced_log_file_path: Optional[Union[str, Path]] = None
   
@@ -31,15 +52,11 @@ class EnhancedLoggingConfig(YamlModel):
   @model_validator(mode="after")
   def set_default_log_path(self):
     if self.enhanced_logging and not self.enhanced_log_file_path:
-      # Create default path: enhanced_logs/YYYYMMDD_HHMMSS.json
-      timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-      log_dir = METAGPT_ROOT / "enhanced_logs"
-      log_dir.mkdir(parents=True, exist_ok=True)
-      self.enhanced_log_file_path = log_dir / f"{timestamp}.json"
+      self.enhanced_log_file_path = _default_enhanced_log_path()
     elif self.enhanced_logging and self.enhanced_log_file_path:
       # Ensure directory exists for custom path
       log_path = Path(self.enhanced_log_file_path)
-      log_path.parent.mkdir(parents=True, exist_ok=True)
+      _ensure_log_dir(log_path.parent)
       self.enhanced_log_file_path = log_path
-    
+
     return self
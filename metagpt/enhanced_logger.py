@@ -5,41 +5,53 @@
 @Author  : Enhanced Logging Implementation
 @File  : enhanced_logger.py
 """
+import atexit
 import json
+import queue
 import threading
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+try:
+  import orjson  # C-accelerated JSON, optional
+except ImportError:
+  orjson = None
+
+
+def _now_iso() -> str:
+  """UTC timestamp like 2025-06-24T21:36:00.000Z (utcnow is deprecated in 3.12+)"""
+  return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
 
 class EnhancedLogger:
   """
-  Singleton enhanced logger that captures LLM API requests and agent messages
+  Enhanced logger that captures LLM API requests and agent messages
   in a unified JSON format without interfering with the existing loguru system.
+
+  Use the module-level `enhanced_logger` instance rather than constructing
+  new ones; separate instances would compete for the same log file.
   """
-  
-  _instance = None
-  _lock = threading.Lock()
-  
-  def __new__(cls):
-    if cls._instance is None:
-      with cls._lock:
-        if cls._instance is None:
-          cls._instance = super().__new__(cls)
-    return cls._instance
-  
+
+  _SENTINEL = object()  # tells the writer thread to drain and exit
+  _BATCH_SIZE = 256  # max entries per bulk write
+
   def __init__(self):
-    if not hasattr(self, 'initialized'):
-      self.initialized = True
-      self.enabled = False
-      self.log_file_path: Optional[Path] = None
-      self.file_lock = threading.Lock()
-      self._log_entries: List[Dict[str, Any]] = []
+    self.enabled = False
+    self.log_file_path: Optional[Path] = None
+    self.file_lock = threading.Lock()
+    self._fh = None
+    self._q: queue.SimpleQueue = queue.SimpleQueue()
+    self._worker: Optional[threading.Thread] = None
+    self._batch_buffer: Optional[List[Dict[str, Any]]] = None
   
   def configure(self, enabled: bool, log_file_path: Optional[Union[str, Path]] = None):
     """Configure the enhanced logger"""
+    self._stop_worker()
+    self._close_fh()  # drop any handle pointing at a previous log file
     self.enabled = enabled
-    
+
     if enabled:
       # Ensure we have a log file path when enabled
       if log_file_path:
@@ -50,17 +62,40 @@ class EnhancedLogger:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_dir = Path("enhanced_logs")
         log_dir.mkdir(parents=True, exist_ok=True)
-        self.log_file_path = log_dir / f"{timestamp}.json"
-      
-      # Ensure parent directory exists and initialize file
+        self.log_file_path = log_dir / f"{timestamp}.jsonl"
+
+      # Ensure parent directory exists; the file itself is created lazily in append mode
       self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
-      if not self.log_file_path.exists():
-        self._write_log_entries([])
-      
+
+      # All disk I/O happens on a single background thread so producers never block
+      self._worker = threading.Thread(target=self._drain, name="enhanced-logger", daemon=True)
+      self._worker.start()
+      atexit.register(self._stop_worker)
+
       print(f"Enhanced logging enabled")
       print(f"Enhanced log file: {self.log_file_path}")
     else:
       print(f"Enhanced logging disabled")
+
+  def _ensure_fh(self):
+    """Open the log file once in append mode and keep it open"""
+    if self._fh is None:
+      if orjson is not None:
+        # binary append: orjson emits UTF-8 bytes directly, no intermediate str
+        self._fh = open(self.log_file_path, 'ab')
+      else:
+        self._fh = open(self.log_file_path, 'a', encoding='utf-8', buffering=1)
+      atexit.register(self._close_fh)
+    return self._fh
+
+  def _close_fh(self):
+    with self.file_lock:
+      if self._fh is not None:
+        try:
+          self._fh.close()
+        except Exception:
+          pass
+        self._fh = None
   
   def log_api_request(
     self,
@@ -75,7 +110,7 @@ class EnhancedLogger:
     
     try:
       log_entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _now_iso(),
         "event": "api_request",
         "model": model,
         "request": request_messages,
@@ -103,7 +138,7 @@ class EnhancedLogger:
     
     try:
       log_entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _now_iso(),
         "event": "message",
         "message": {
           "sender": sender,
@@ -118,44 +153,133 @@ class EnhancedLogger:
       print(f"Enhanced logging failed for agent message: {e}")
   
   def _append_log_entry(self, entry: Dict[str, Any]):
-    """Thread-safe append of log entry to file"""
+    """Hand one log entry to the background writer; no lock, no I/O on the caller's thread"""
     if not self.log_file_path:
       return
-    
+
+    if self._batch_buffer is not None:
+      self._batch_buffer.append(entry)
+    elif self._worker is not None and self._worker.is_alive():
+      self._q.put_nowait(entry)
+    else:
+      # No writer thread (e.g. enabled directly without configure()): write synchronously
+      self._write_batch([entry])
+
+  @contextmanager
+  def batch(self):
+    """Coalesce every entry logged inside the block into one bulk write"""
+    if self._batch_buffer is not None:
+      yield  # already batching (nested use): keep the outer buffer
+      return
+
+    self._batch_buffer = []
+    try:
+      yield
+    finally:
+      buffered, self._batch_buffer = self._batch_buffer, None
+      if buffered:
+        if self._worker is not None and self._worker.is_alive():
+          self._q.put_nowait(buffered)
+        else:
+          self._write_batch(buffered)
+
+  def _drain(self):
+    """Writer thread: pop queued entries, batch them, and issue one bulk write per batch"""
+    stop = False
+    while not stop:
+      item = self._q.get()
+      batch = []
+      events = []
+      while True:
+        if item is self._SENTINEL:
+          stop = True
+        elif isinstance(item, threading.Event):
+          events.append(item)
+        elif isinstance(item, list):  # pre-batched entries from batch()
+          batch.extend(item)
+        else:
+          batch.append(item)
+        if len(batch) >= self._BATCH_SIZE:
+          break
+        try:
+          item = self._q.get_nowait()
+        except queue.Empty:
+          break
+      if batch:
+        self._write_batch(batch)
+      for event in events:
+        event.set()
+
+  def _write_batch(self, entries: List[Dict[str, Any]]):
+    """Thread-safe bulk append of JSONL records to the log file"""
     with self.file_lock:
       try:
-        # Read existing entries
-        if self.log_file_path.exists():
-          with open(self.log_file_path, 'r', encoding='utf-8') as f:
-            try:
-              entries = json.load(f)
-            except json.JSONDecodeError:
-              entries = []
+        fh = self._ensure_fh()
+        if orjson is not None:
+          opts = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+          fh.write(b"".join(orjson.dumps(entry, option=opts) for entry in entries))
+          fh.flush()  # binary mode has no line buffering
         else:
-          entries = []
-        
-        # Append new entry
-        entries.append(entry)
-        
-        # Write back to file
-        self._write_log_entries(entries)
-        
+          fh.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
       except Exception as e:
         print(f"Failed to write enhanced log entry: {e}")
-  
-  def _write_log_entries(self, entries: List[Dict[str, Any]]):
-    """Write log entries to file"""
+
+  def flush(self, timeout: float = 5.0):
+    """Block until every entry queued so far has been written to disk"""
+    if self._worker is None or not self._worker.is_alive():
+      return
+    flushed = threading.Event()
+    self._q.put(flushed)
+    flushed.wait(timeout)
+
+  def _stop_worker(self):
+    """Ask the writer thread to drain remaining entries and exit"""
+    worker, self._worker = self._worker, None
+    if worker is not None and worker.is_alive():
+      self._q.put(self._SENTINEL)
+      worker.join(timeout=5.0)
+
+  def flush_as_json_array(self, output_path: Optional[Union[str, Path]] = None):
+    """Compact the JSONL log into a pretty-printed JSON array.
+
+    Tooling utility only - never called on the logging hot path.
+    """
     if not self.log_file_path:
+      return
+    self.flush()
+    if not self.log_file_path.exists():
+      return
+
+    with self.file_lock:
+      if self._fh is not None:
+        self._fh.flush()
+      entries = []
+      with open(self.log_file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+          line = line.strip()
+          if not line:
+            continue
+          try:
+            entries.append(orjson.loads(line) if orjson is not None else json.loads(line))
+          except ValueError:
+            continue
+
+    self._write_log_entries(entries, output_path or self.log_file_path.with_suffix(".json"))
+
+  def _write_log_entries(self, entries: List[Dict[str, Any]], output_path: Optional[Union[str, Path]] = None):
+    """Write log entries to file as a JSON array (compaction path only)"""
+    output_path = Path(output_path) if output_path else self.log_file_path
+    if not output_path:
       print("Enhanced logging: No log file path set")
       return
-    
+
     try:
       # Ensure parent directory exists
-      self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
-      with open(self.log_file_path, 'w', encoding='utf-8') as f:
+      output_path.parent.mkdir(parents=True, exist_ok=True)
+      with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(entries, f, indent=2, ensure_ascii=False)
     except Exception as e:
-      print(f"Enhanced logging: Failed to write to {self.log_file_path}: {e}")
+      print(f"Enhanced logging: Failed to write to {output_path}: {e}")
   
   def get_status(self) -> Dict[str, Any]:
     """Get current status of enhanced logger for debugging"""
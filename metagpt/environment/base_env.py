@@ -9,11 +9,20 @@ from typing import Any, Dict, Iterable, Optional, Set, Union
 
 from gymnasium import spaces
 from gymnasium.core import ActType, ObsType
-from pydantic import BaseModel, ConfigDict, Field, SerializeAsAny, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    SerializeAsAny,
+    model_validator,
+)
 
 from metagpt.base import BaseEnvironment, BaseRole
 from metagpt.base.base_env_space import BaseEnvAction, BaseEnvObsParams
+from metagpt.const import MESSAGE_ROUTE_TO_ALL
 from metagpt.context import Context
+from metagpt.enhanced_logger import enhanced_logger
 from metagpt.environment.api.env_api import (
     EnvAPIAbstract,
     ReadAPIRegistry,
@@ -22,7 +31,7 @@ from metagpt.environment.api.env_api import (
 from metagpt.logs import logger
 from metagpt.memory import Memory
 from metagpt.schema import Message
-from metagpt.utils.common import get_function_schema, is_coroutine_func, is_send_to
+from metagpt.utils.common import get_function_schema, is_coroutine_func
 from metagpt.utils.git_repository import GitRepository
 
 
@@ -134,6 +143,19 @@ class Environment(ExtEnv):
     history: Memory = Field(default_factory=Memory)  # For debug
     context: Context = Field(default_factory=Context, exclude=True)
 
+    # Sender lookup caches; rebuilt lazily whenever the role set changes
+    _roles_version: int = PrivateAttr(default=0)
+    _role_lookup_version: int = PrivateAttr(default=-1)
+    _role_by_name: dict = PrivateAttr(default_factory=dict)
+    _role_by_str: dict = PrivateAttr(default_factory=dict)
+    _role_by_class_name: dict = PrivateAttr(default_factory=dict)
+    _sender_cache: dict = PrivateAttr(default_factory=dict)
+    _role_labels: dict = PrivateAttr(default_factory=dict)
+
+    # Inverted address->subscribers index; rebuilt lazily after set_addresses
+    _addr_index: dict = PrivateAttr(default_factory=dict)
+    _addr_index_dirty: bool = PrivateAttr(default=True)
+
     def reset(
         self,
         *,
@@ -160,42 +182,64 @@ class Environment(ExtEnv):
         self.roles[role.name] = role
         role.set_env(self)
         role.context = self.context
+        self._roles_version += 1
 
     def add_roles(self, roles: Iterable[BaseRole]):
         """增加一批在当前环境的角色
         Add a batch of characters in the current environment
         """
+        roles = list(roles)  # the annotation allows generators, which a second loop would find exhausted
         for role in roles:
             self.roles[role.name] = role
 
-        for role in roles:  # setup system message with roles
+        for role in roles:  # setup system message with roles; prefixes need the complete role set above
             role.context = self.context
             role.set_env(self)
+        self._roles_version += 1
+
+    def _rebuild_role_lookup(self):
+        """Index roles by name, any_to_str and class name for O(1) sender resolution."""
+        from metagpt.utils.common import any_to_str
+
+        self._role_by_name = {}
+        self._role_by_str = {}
+        self._role_by_class_name = {}
+        for role in self.roles.values():
+            name = getattr(role, "name", None)
+            if name:
+                self._role_by_name.setdefault(name, role)
+            self._role_by_str.setdefault(any_to_str(role), role)
+            self._role_by_class_name.setdefault(role.__class__.__name__, role)
+        self._sender_cache.clear()
+        self._role_labels.clear()
+        self._role_lookup_version = self._roles_version
+
+    def _role_label(self, role: BaseRole) -> str:
+        """Return the cached 'Name(Class)' label for a role, computing it on first use."""
+        label = self._role_labels.get(role)
+        if label is None:
+            label = f"{getattr(role, 'name', 'Unknown')}({role.__class__.__name__})"
+            self._role_labels[role] = label
+        return label
 
     def _find_sender_role(self, sent_from: str) -> Optional[BaseRole]:
         """Find the role that sent the message using multiple matching strategies."""
         if not sent_from:
             return None
-        
-        # Strategy 1: Match by role name
-        for role in self.roles.values():
-            if hasattr(role, 'name') and role.name == sent_from:
-                return role
-        
-        # Strategy 2: Match by string representation (any_to_str)
-        from metagpt.utils.common import any_to_str
-        for role in self.roles.values():
-            if any_to_str(role) == sent_from:
-                return role
-        
-        # Strategy 3: Match by class name (handle cases like "__mp_main__.SimpleCoder")
-        if "." in sent_from:
-            class_name = sent_from.split(".")[-1]
-            for role in self.roles.values():
-                if role.__class__.__name__ == class_name:
-                    return role
-        
-        return None
+
+        if self._role_lookup_version != self._roles_version:
+            self._rebuild_role_lookup()
+        if sent_from in self._sender_cache:
+            return self._sender_cache[sent_from]
+
+        # Strategy 1: match by role name; Strategy 2: match by string representation (any_to_str)
+        role = self._role_by_name.get(sent_from) or self._role_by_str.get(sent_from)
+        # Strategy 3: match by class name (handle cases like "__mp_main__.SimpleCoder")
+        if role is None and "." in sent_from:
+            role = self._role_by_class_name.get(sent_from.split(".")[-1])
+
+        self._sender_cache[sent_from] = role
+        return role
     
     def _format_sender(self, message: Message) -> str:
         """Format sender as Name(Role) or fallback to a reasonable representation."""
@@ -204,9 +248,7 @@ class Environment(ExtEnv):
         
         sender_role = self._find_sender_role(message.sent_from)
         if sender_role:
-            role_name = getattr(sender_role, 'name', 'Unknown')
-            role_class = sender_role.__class__.__name__
-            return f"{role_name}({role_class})"
+            return self._role_label(sender_role)
         
         # Fallback: extract class name if possible
         if "." in message.sent_from:
@@ -215,24 +257,41 @@ class Environment(ExtEnv):
         
         return message.sent_from
     
-    def _format_recipients(self, message: Message) -> list[str]:
-        """Format recipients as list of Name(Role) strings."""
-        recipients = []
+    def _rebuild_addr_index(self):
+        """Invert member_addrs into an address->subscribers map for O(1) routing."""
+        index = {}
         for role, addrs in self.member_addrs.items():
-            if is_send_to(message, addrs):
-                role_name = getattr(role, 'name', 'Unknown')
-                role_class = role.__class__.__name__
-                recipients.append(f"{role_name}({role_class})")
-        return recipients
+            for addr in addrs:
+                index.setdefault(addr, []).append(role)
+        self._addr_index = index
+        self._addr_index_dirty = False
+
+    def _resolve_recipients(self, message: Message) -> list[BaseRole]:
+        """Return the roles subscribed to any of the message's send_to addresses."""
+        if MESSAGE_ROUTE_TO_ALL in message.send_to:
+            return list(self.member_addrs)
+        if self._addr_index_dirty:
+            self._rebuild_addr_index()
+        index = self._addr_index
+        # dict.fromkeys dedupes while preserving the order roles were matched in
+        return list(dict.fromkeys(role for addr in message.send_to for role in index.get(addr, ())))
+
+    def _format_recipients(self, message: Message, recipients: Optional[list[BaseRole]] = None) -> list[str]:
+        """Format recipients as list of Name(Role) strings."""
+        if recipients is None:
+            recipients = self._resolve_recipients(message)
+        return [self._role_label(role) for role in recipients]
     
-    def _log_enhanced_message(self, message: Message) -> None:
+    def _log_enhanced_message(self, message: Message, recipients: Optional[list[BaseRole]] = None) -> None:
         """Log agent message communication to enhanced logger."""
+        if not enhanced_logger.enabled:
+            # Default configuration: bail before any sender/recipient formatting
+            return
+
         try:
-            from metagpt.enhanced_logger import enhanced_logger
-            
             sender = self._format_sender(message)
-            recipients = self._format_recipients(message)
-            
+            recipients = self._format_recipients(message, recipients)
+
             enhanced_logger.log_agent_message(
                 sender=sender,
                 recipients=recipients,
@@ -251,19 +310,20 @@ class Environment(ExtEnv):
         route the message to the message recipient is a problem addressed by the transport framework designed
         in RFC 113.
         """
-        logger.debug(f"publish_message: {message.dump()}")
-        
+        # lazy=True defers message.dump() until the DEBUG level is actually enabled
+        logger.opt(lazy=True).debug("publish_message: {}", message.dump)
+
+        # Resolve recipients once; routing and enhanced logging share the result
+        recipients = self._resolve_recipients(message)
+
         # Enhanced logging - log agent message communication
-        self._log_enhanced_message(message)
-        
+        self._log_enhanced_message(message, recipients)
+
         # Route message to recipients
-        found = False
-        for role, addrs in self.member_addrs.items():
-            if is_send_to(message, addrs):
-                role.put_message(message)
-                found = True
-        
-        if not found:
+        for role in recipients:
+            role.put_message(message)
+
+        if not recipients:
             logger.warning(f"Message no recipients: {message.dump()}")
         
         self.history.add(message)  # For debug
@@ -275,15 +335,16 @@ class Environment(ExtEnv):
         """
         for _ in range(k):
             futures = []
-            for role in self.roles.values():
-                if role.is_idle:
-                    continue
-                future = role.run()
-                futures.append(future)
+            with enhanced_logger.batch():  # one bulk log write per tick
+                for role in self.roles.values():
+                    if role.is_idle:
+                        continue
+                    future = role.run()
+                    futures.append(future)
 
-            if futures:
-                await asyncio.gather(*futures)
-            logger.debug(f"is idle: {self.is_idle}")
+                if futures:
+                    await asyncio.gather(*futures)
+            logger.opt(lazy=True).debug("is idle: {}", lambda: self.is_idle)
 
     def get_roles(self) -> dict[str, BaseRole]:
         """获得环境内的所有角色
@@ -315,6 +376,7 @@ class Environment(ExtEnv):
     def set_addresses(self, obj, addresses):
         """Set the addresses of the object"""
         self.member_addrs[obj] = addresses
+        self._addr_index_dirty = True
 
     def archive(self, auto_archive=True):
         if auto_archive and self.context.kwargs.get("project_path"):
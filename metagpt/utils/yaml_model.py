@@ -11,6 +11,13 @@ from typing import Dict, Optional
 import yaml
 from pydantic import BaseModel, model_validator
 
+try:
+    from yaml import CSafeLoader as _SafeLoader  # libyaml C binding, much faster
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+_YAML_CACHE: Dict[str, tuple] = {}  # path -> (mtime, parsed dict)
+
 
 class YamlModel(BaseModel):
     """Base class for yaml model"""
@@ -19,11 +26,18 @@ class YamlModel(BaseModel):
 
     @classmethod
     def read_yaml(cls, file_path: Path, encoding: str = "utf-8") -> Dict:
-        """Read yaml file and return a dict"""
+        """Read yaml file and return a dict, reusing parses of unchanged files"""
         if not file_path.exists():
             return {}
+        key = str(file_path)
+        mtime = file_path.stat().st_mtime
+        cached = _YAML_CACHE.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         with open(file_path, "r", encoding=encoding) as file:
-            return yaml.safe_load(file)
+            data = yaml.load(file, Loader=_SafeLoader)
+        _YAML_CACHE[key] = (mtime, data)
+        return data
 
     @classmethod
     def from_yaml_file(cls, file_path: Path) -> "YamlModel":
